@@ -16,24 +16,31 @@ Fixed and complete large randomized seeding script for the Restaurant POS backen
   - StockMovements (initial purchases + usage)
   - Orders (completed/pending/cancelled) per outlet
 - Idempotent where reasonable (upserts for roles). Meant for dev/test only.
+- Usage stock movements, menu items and table status updates are written with
+  w=0 (unacknowledged), so errors on those writes are not reported.
 
 Prereqs:
   pip install pymongo python-dotenv faker bcrypt
+  MongoDB 4.2+ (initial stock movements are written with an aggregation $merge)
 
 Usage:
   export MONGO_URI="mongodb://localhost:27017/pos"
+  export SEED_BCRYPT_ROUNDS=12   # optional; bcrypt cost for seeded passwords (default 4)
   python seed_large_random_fixed.py
 """
 
 import os
 import sys
 import random
-import uuid
+import secrets
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pprint import pprint
 
 from bson import ObjectId
-from pymongo import MongoClient, ReturnDocument
+from pymongo import InsertOne, MongoClient, ReturnDocument, UpdateOne
+from pymongo.write_concern import WriteConcern
 from faker import Faker
 import bcrypt
 
@@ -52,11 +59,27 @@ MENU_ITEMS_PER_REST = int(os.environ.get("MENU_ITEMS_PER_REST", "60"))
 INVENTORY_ITEMS_PER_REST = int(os.environ.get("INVENTORY_ITEMS_PER_REST", "40"))
 TABLES_PER_OUTLET = int(os.environ.get("TABLES_PER_OUTLET", "12"))
 ORDERS_PER_OUTLET = int(os.environ.get("ORDERS_PER_OUTLET", "30"))
+SUPPLIERS_PER_REST = 2
+MAX_CASHIERS_PER_REST = 3
+SEED_WORKERS = int(os.environ.get("SEED_WORKERS", "8"))
 DEFAULT_PASSWORD = os.environ.get("DEFAULT_PASSWORD", "cashier123")
+# 4 is bcrypt's minimum cost; fine for dev/test seed data
+SEED_BCRYPT_ROUNDS = int(os.environ.get("SEED_BCRYPT_ROUNDS", "4"))
+
+# value pools for hot-loop picks, drawn with random.choices(pool, k=N) per batch
+UNIT_POOL = ["kg","pcs","ltr"]
+MENU_SUFFIX_POOL = ["Special","Deluxe","Classic","Platter","Bowl"]
+SEATS_POOL = [2,4,6]
+ZONE_POOL = ["Main Floor","Patio","Balcony"]
+ITEM_QTY_POOL = [1,1,1,2]
+ORDER_STATUS_POOL = ["completed","pending","cancelled"]
+ORDER_STATUS_WEIGHTS = [0.6,0.25,0.15]
+
+SEED = 42
 
 fake = Faker()
-Faker.seed(42)
-random.seed(42)
+Faker.seed(SEED)
+random.seed(SEED)
 
 # ---------------- Helpers ----------------
 def now():
@@ -66,11 +89,11 @@ def oid():
     return ObjectId()
 
 def uuid_short():
-    return uuid.uuid4().hex[:6]
+    return secrets.token_hex(3)
 
 def hashed_password(password):
     pw = password.encode('utf-8')
-    salt = bcrypt.gensalt(rounds=12)
+    salt = bcrypt.gensalt(rounds=SEED_BCRYPT_ROUNDS)
     return bcrypt.hashpw(pw, salt).decode('utf-8')
 
 def upsert_one(coll, filter_doc, set_doc):
@@ -79,6 +102,11 @@ def upsert_one(coll, filter_doc, set_doc):
 def insert_one(coll, doc):
     return coll.insert_one(doc).inserted_id
 
+def insert_many(coll, docs):
+    # unordered so one bad doc doesn't abort the rest of the batch
+    if docs:
+        coll.insert_many(docs, ordered=False)
+
 def ensure_index(coll, keys, unique=False):
     try:
         coll.create_index(keys, unique=unique)
@@ -86,28 +114,421 @@ def ensure_index(coll, keys, unique=False):
         # Index already exists or minor conflict; continue
         print("Index creation warning:", e)
 
-def generate_inventory_names(n):
-    pool = [
-        "Rice (kg)","Chicken (kg)","Canned Cola (pcs)","Burger Buns (pcs)","Lettuce (kg)","Tomato (kg)",
-        "Cheese (kg)","Potato (kg)","Onion (kg)","Garlic (kg)","Oil (ltr)","Sugar (kg)","Salt (kg)",
-        "Flour (kg)","Butter (kg)","Eggs (dozen)","Milk (ltr)","Yogurt (kg)","Paneer (kg)","Fish (kg)",
-        "Pasta (kg)","Tomato Sauce (ltr)","Chilli Sauce (ltr)","Mayonnaise (ltr)","Bread Loaf (pcs)",
-        "Veg Mix (kg)","Spice Mix (kg)","Coconut (pcs)","Coriander (kg)","Curry Leaves (kg)"
-    ]
-    if n <= len(pool):
-        return pool[:n]
-    names = pool[:]
+def drop_index(coll, keys):
+    try:
+        coll.drop_index(keys)
+    except Exception as e:
+        # Index missing (fresh DB) or named differently; continue
+        print("Index drop warning:", e)
+
+def rebuild_indexes(indexes):
+    # create_index directly (not ensure_index) so duplicate keys from the load fail loudly;
+    # every index is still attempted so one bad collection doesn't leave the rest unconstrained
+    failures = []
+    for coll, keys in indexes:
+        try:
+            coll.create_index(keys, unique=True)
+        except Exception as e:
+            failures.append(f"{coll.name} {keys}: {e}")
+    if failures:
+        raise RuntimeError("Unique index rebuild failed: " + "; ".join(failures))
+
+def sku_key(name):
+    return name.replace(' ','').upper()[:12]
+
+INVENTORY_NAME_POOL = [
+    "Rice (kg)","Chicken (kg)","Canned Cola (pcs)","Burger Buns (pcs)","Lettuce (kg)","Tomato (kg)",
+    "Cheese (kg)","Potato (kg)","Onion (kg)","Garlic (kg)","Oil (ltr)","Sugar (kg)","Salt (kg)",
+    "Flour (kg)","Butter (kg)","Eggs (dozen)","Milk (ltr)","Yogurt (kg)","Paneer (kg)","Fish (kg)",
+    "Pasta (kg)","Tomato Sauce (ltr)","Chilli Sauce (ltr)","Mayonnaise (ltr)","Bread Loaf (pcs)",
+    "Veg Mix (kg)","Spice Mix (kg)","Coconut (pcs)","Coriander (kg)","Curry Leaves (kg)"
+]
+# (name, sku_key) pairs for the fixed pool, computed once at import
+INVENTORY_NAME_KEYS = [(name, sku_key(name)) for name in INVENTORY_NAME_POOL]
+
+def generate_inventory_names(n, rng, words):
+    """Return n (name, sku_key) pairs for inventory items; extras past the fixed pool use words."""
+    if n <= len(INVENTORY_NAME_KEYS):
+        return INVENTORY_NAME_KEYS[:n]
+    names = INVENTORY_NAME_KEYS[:]
     count = 0
     while len(names) < n:
-        plural = random.choice(["(kg)","(pcs)","(ltr)", "(dozen)"])
-        names.append(f"{fake.word().capitalize()} Ingredient {count} {plural}")
+        plural = rng.choice(["(kg)","(pcs)","(ltr)", "(dozen)"])
+        name = f"{next(words).capitalize()} Ingredient {count} {plural}"
+        names.append((name, sku_key(name)))
         count += 1
     return names[:n]
 
+def generate_fake_pool():
+    """Pre-generate the Faker values one restaurant consumes, sized for the worst case."""
+    n_people = 1 + SUPPLIERS_PER_REST
+    n_places = 1 + MAX_OUTLETS_PER_REST + SUPPLIERS_PER_REST
+    return {
+        "companies": [fake.company() for _ in range(n_people)],
+        "names": [fake.name() for _ in range(n_people)],
+        "emails": [fake.company_email() for _ in range(n_people)],
+        "phones": [fake.phone_number() for _ in range(n_places)],
+        "addresses": [fake.address() for _ in range(n_places)],
+        "domains": [fake.domain_name() for _ in range(1 + MAX_CASHIERS_PER_REST)],
+        "catch_phrases": [fake.catch_phrase() for _ in range(MENU_ITEMS_PER_REST)],
+        "sentences": [fake.sentence(nb_words=8) for _ in range(MENU_ITEMS_PER_REST)],
+        "words": [fake.word() for _ in range(max(0, INVENTORY_ITEMS_PER_REST - len(INVENTORY_NAME_POOL)))],
+    }
+
+def seed_restaurant(r_index, shared_ctx):
+    """Seed one restaurant with its outlets, inventory, menu, tables, users and orders.
+
+    Runs in a worker thread. Randomness comes from this restaurant's own seeded
+    Random and pre-generated Faker values, so the MongoClient behind the collection
+    handles in shared_ctx is the only shared state. The restaurant and its outlet,
+    supplier, category and user docs (one insert_many each) go in before any of the
+    docs that reference them. Returns the restaurant doc.
+    """
+    restaurants_col = shared_ctx["restaurants_col"]
+    outlets_col = shared_ctx["outlets_col"]
+    suppliers_col = shared_ctx["suppliers_col"]
+    categories_col = shared_ctx["categories_col"]
+    users_col = shared_ctx["users_col"]
+    stock_col = shared_ctx["stock_col"]
+    inventory_col = shared_ctx["inventory_col"]
+    tables_col = shared_ctx["tables_col"]
+    orders_col = shared_ctx["orders_col"]
+    # unacknowledged (w=0) handles for the high-volume writes
+    menuitems_bulk = shared_ctx["menuitems_bulk"]
+    tables_bulk = shared_ctx["tables_bulk"]
+    stock_bulk = shared_ctx["stock_bulk"]
+    roles_map = shared_ctx["roles_map"]
+    default_pw_hash = shared_ctx["default_pw_hash"]
+    rng = shared_ctx["rngs"][r_index]
+    # this restaurant's slot of pre-generated Faker values, consumed in order
+    fp = {k: iter(v) for k, v in shared_ctx["fake_pools"][r_index].items()}
+
+    outlets_buf = []
+    suppliers_buf = []
+    categories_buf = []
+    users_buf = []
+
+    # one timestamp per restaurant; datetimes are immutable so sharing is safe
+    ts = now()
+    # outlet ids are client-side, so the restaurant doc can carry them from the start
+    num_outlets = rng.randint(1, MAX_OUTLETS_PER_REST)
+    outlet_ids = [oid() for _ in range(num_outlets)]
+
+    rest_name = f"{next(fp['companies'])} {rng.choice(['Bistro','Cafe','Kitchen','Diner','Grill','House'])}"
+    rest_doc = {
+        "_id": oid(),
+        "name": rest_name,
+        "legalName": rest_name + " Pvt Ltd",
+        "taxNumber": "GST" + uuid_short(),
+        "ownerName": next(fp["names"]),
+        "contactEmail": next(fp["emails"]),
+        "contactPhone": next(fp["phones"]),
+        "address": next(fp["addresses"]),
+        "cuisine": rng.sample(["Indian","Italian","Continental","Asian","Mexican","Fusion"], k=2),
+        "settings": {},
+        "outlets": outlet_ids,
+        "createdAt": ts,
+        "updatedAt": ts
+    }
+
+    # create 1..MAX_OUTLETS_PER_REST outlets
+    for o, outlet_id in enumerate(outlet_ids):
+        outlet_doc = {
+            "_id": outlet_id,
+            "name": f"{rest_doc['name']} - Outlet {o+1}",
+            "code": f"OLT{rng.randint(1000,9999)}",
+            "address": next(fp["addresses"]),
+            "phone": next(fp["phones"]),
+            "timeZone": "Asia/Kolkata",
+            "currency": rng.choice(["INR","USD","EUR"]),
+            "settings": {},
+            "createdAt": ts,
+            "updatedAt": ts
+        }
+        outlets_buf.append(outlet_doc)
+
+    # create suppliers for this restaurant
+    suppliers = []
+    for s in range(SUPPLIERS_PER_REST):
+        sup = {"_id": oid(), "restaurant": rest_doc["_id"], "name": next(fp["companies"]), "contact": next(fp["names"]), "phone": next(fp["phones"]), "email": next(fp["emails"]), "address": next(fp["addresses"]), "createdAt": ts, "updatedAt": ts}
+        suppliers_buf.append(sup)
+        suppliers.append(sup)
+
+    # categories
+    categories = []
+    cat_names = rng.sample(["Entrees","Burgers","Drinks","Desserts","Salads","Sides","Breakfast"], k=4)
+    for i,cn in enumerate(cat_names):
+        c = {"_id": oid(), "restaurant": rest_doc["_id"], "name": cn, "order": i+1, "isVisible": True, "createdAt": ts, "updatedAt": ts}
+        categories_buf.append(c)
+        categories.append(c)
+
+    # users: admin + cashiers
+    admin_user = {
+        "_id": oid(),
+        "email": f"admin+{uuid_short()}@{next(fp['domains'])}",
+        "name": f"{rest_doc['name']} Admin",
+        "passwordHash": default_pw_hash,
+        "restaurant": rest_doc["_id"],
+        "roles": [roles_map["Admin"]["_id"]],
+        "isActive": True,
+        "createdAt": ts,
+        "updatedAt": ts
+    }
+
+    users_buf.append(admin_user)
+    for ccount in range(rng.randint(1, MAX_CASHIERS_PER_REST)):
+        cash_user = {
+            "_id": oid(),
+            "email": f"cashier{ccount+1}-{uuid_short()}@{next(fp['domains'])}",
+            "name": f"Cashier {ccount+1} {rest_doc['name']}",
+            "passwordHash": default_pw_hash,
+            "restaurant": rest_doc["_id"],
+            "roles": [roles_map["Cashier"]["_id"]],
+            "outlet": rng.choice(outlet_ids),
+            "isActive": True,
+            "createdAt": ts,
+            "updatedAt": ts
+        }
+
+        users_buf.append(cash_user)
+
+    # parent docs go in before anything that references them, so a failed run
+    # never leaves inventory, menus, tables or orders pointing at missing docs
+    restaurants_col.insert_one(rest_doc)
+    insert_many(outlets_col, outlets_buf)
+    insert_many(suppliers_col, suppliers_buf)
+    insert_many(categories_col, categories_buf)
+    insert_many(users_col, users_buf)
+
+    # create inventory items for restaurant
+    inv_items = []
+    inv_names = generate_inventory_names(INVENTORY_ITEMS_PER_REST, rng, fp["words"])
+    inv_units = rng.choices(UNIT_POOL, k=len(inv_names))
+    for i, ((name, name_key), unit) in enumerate(zip(inv_names, inv_units)):
+        inv = {
+            "_id": oid(),
+            "restaurant": rest_doc["_id"],
+            "outlet": rng.choice(outlet_ids),
+            "name": name,
+            "sku": f"INV-{name_key}-{i+1:03d}",
+            "unit": unit,
+            "costPrice": round(10 + rng.random() * 490, 2),
+            "currentQty": rng.randint(30,300),
+            "parLevel": rng.randint(5,50),
+            "supplier": rng.choice(suppliers)["_id"],
+            "isTracked": True,
+            "location": "Main Store",
+            "meta": {},
+            "createdAt": ts,
+            "updatedAt": ts
+        }
+        inv_items.append(inv)
+    if inv_items:
+        inventory_col.insert_many(inv_items)
+    inv_map = {it["name"]: it for it in inv_items}
+    inv_by_id = {it["_id"]: it for it in inv_items}
+
+    # menu items
+    menu_items = []
+    menu_cats = rng.choices(categories, k=MENU_ITEMS_PER_REST)
+    menu_suffixes = rng.choices(MENU_SUFFIX_POOL, k=MENU_ITEMS_PER_REST)
+    menu_outlets = rng.choices(outlet_ids, k=MENU_ITEMS_PER_REST)
+    for m in range(MENU_ITEMS_PER_REST):
+        cat = menu_cats[m]
+        item_name = (next(fp["catch_phrases"]).split(" - ")[0][:30]).strip() + " " + menu_suffixes[m]
+        base_price = round(80 + rng.random() * 520, 2)
+        # build recipe: pick 1-4 inventory items
+        recipe = []
+        n_recipe = rng.randint(1,4) if inv_items else 0
+        for inv_choice in rng.choices(inv_items, k=n_recipe):
+            qty = round(0.01 + rng.random() * 1.49, 3) if inv_choice["unit"]=="kg" else rng.randint(1,3)
+            recipe.append({"inventoryItemId": inv_choice["_id"], "qty": qty, "unit": inv_choice["unit"]})
+        menu = {
+            "_id": oid(),
+            "restaurant": rest_doc["_id"],
+            "categories": [cat["_id"]],
+            "name": item_name,
+            "description": next(fp["sentences"]),
+            "image": None,
+            "basePrice": base_price,
+            # counter is unique across the whole run, unlike a random suffix
+            "sku": f"MI-{r_index * MENU_ITEMS_PER_REST + m + 1:07d}",
+            "isActive": True,
+            "isTaxable": True,
+            "variants": [],
+            "modifiers": [{"name": "Extra", "price": round(base_price*0.25,2)}] if rng.random() < 0.3 else [],
+            "prepTimeMins": rng.randint(2,25),
+            "tags": [],
+            "meta": {"recipe": recipe},
+            "outletAvailability": [{"outlet": menu_outlets[m], "isAvailable": True}],
+            "createdAt": ts,
+            "updatedAt": ts
+        }
+        menu_items.append(menu)
+    if menu_items:
+        insert_many(menuitems_bulk, menu_items)
+
+    # tables per outlet
+    tables_by_outlet = defaultdict(list)
+    for outlet_id in outlet_ids:
+        tables = tables_by_outlet[outlet_id]
+        table_seats = rng.choices(SEATS_POOL, k=TABLES_PER_OUTLET)
+        table_zones = rng.choices(ZONE_POOL, k=TABLES_PER_OUTLET)
+        for tnum in range(1, TABLES_PER_OUTLET+1):
+            t = {
+                "_id": oid(),
+                "restaurant": rest_doc["_id"],
+                "outlet": outlet_id,
+                "name": f"Table {tnum}",
+                "seats": table_seats[tnum-1],
+                "zone": table_zones[tnum-1],
+                "status": "available",
+                "meta": {},
+                "createdAt": ts,
+                "updatedAt": ts
+            }
+            tables.append(t)
+        if tables:
+            tables_col.insert_many(tables)
+
+    # initial stock movements: derived server-side from the (acknowledged) inventory
+    # insert above, before any order consumption touches currentQty
+    if inv_items:
+        inventory_col.aggregate([
+            {"$match": {"restaurant": rest_doc["_id"]}},
+            {"$project": {
+                "_id": 0,
+                "restaurant": 1,
+                "outlet": 1,
+                "inventoryItem": "$_id",
+                "change": "$currentQty",
+                "type": {"$literal": "purchase"},
+                "reference": {"$concat": ["INIT-", {"$toString": "$_id"}]},
+                "note": {"$literal": "Initial stock seed"},
+                "performedBy": {"$literal": admin_user["_id"]},
+                "createdAt": {"$literal": ts},
+                "updatedAt": {"$literal": ts}
+            }},
+            {"$merge": {"into": stock_col.name}}
+        ])
+
+    # Create orders per outlet
+    for outlet_id in outlet_ids:
+        # filter the docs built above rather than reading them back
+        menus_for_outlet = [m for m in menu_items if any(oa["outlet"] == outlet_id for oa in m["outletAvailability"])][:500]
+        if not menus_for_outlet:
+            menus_for_outlet = menu_items[:500]
+        menu_by_id = {m["_id"]: m for m in menus_for_outlet}
+        tables_for_outlet = tables_by_outlet[outlet_id]
+        orders_batch = []
+        stock_usage_batch = []
+        touched_inv = set()
+        # last status per table wins, so keep only the final update for each
+        table_updates = {}
+        statuses = rng.choices(ORDER_STATUS_POOL, weights=ORDER_STATUS_WEIGHTS, k=ORDERS_PER_OUTLET)
+        for ord_idx in range(ORDERS_PER_OUTLET):
+            chosen_items = []
+            n_items = rng.randint(1,4) if menus_for_outlet else 0
+            for mi, qty in zip(rng.choices(menus_for_outlet, k=n_items), rng.choices(ITEM_QTY_POOL, k=n_items)):
+                chosen_items.append({
+                    "menuItem": mi["_id"],
+                    "name": mi["name"],
+                    "qty": qty,
+                    "price": mi["basePrice"]
+                })
+            subtotal = sum(it["price"] * it["qty"] for it in chosen_items)
+            status = statuses[ord_idx]
+            placed_at = now()
+            order_num = f"ORD-{int(placed_at.timestamp())}-{rng.randrange(1000,9999)}-{uuid_short()}"
+            placed_by_user = admin_user["_id"]
+            table_for_order = rng.choice(tables_for_outlet)["_id"] if tables_for_outlet else None
+
+            order_doc = {
+                "_id": oid(),
+                "restaurant": rest_doc["_id"],
+                "outlet": outlet_id,
+                "table": table_for_order,
+                "orderNumber": order_num,
+                "type": "dine_in" if table_for_order else "counter",
+                "items": chosen_items,
+                "subtotal": subtotal,
+                "taxTotal": 0,
+                "discountTotal": 0,
+                "serviceCharge": 0,
+                "total": subtotal,
+                "payments": [{"method": "cash", "amount": subtotal, "transactionRef": f"TX-{order_num}", "paidAt": placed_at}] if status == "completed" else [],
+                "status": status,
+                "placedAt": placed_at,
+                "placedBy": placed_by_user,
+                "notes": "",
+                "meta": {"seed": True},
+                "createdAt": placed_at,
+                "updatedAt": placed_at
+            }
+            orders_batch.append(order_doc)
+
+            # compute and apply consumption
+            consumptions = {}
+            for it in chosen_items:
+                # menu docs are built above, so meta.recipe and qty are always present
+                recipe = menu_by_id[it["menuItem"]]["meta"]["recipe"]
+                for r in recipe:
+                    iid = r["inventoryItemId"]
+                    qty_needed = r["qty"] * it["qty"]
+                    consumptions[iid] = consumptions.get(iid, 0) + qty_needed
+
+            for iid, qty_needed in consumptions.items():
+                inv_item = inv_by_id.get(iid)
+                if not inv_item:
+                    continue
+                # the in-memory doc is the source of truth; it is flushed as-is below
+                inv_item["currentQty"] = max(0, inv_item["currentQty"] - qty_needed)
+                touched_inv.add(iid)
+                stock_usage_batch.append({
+                    "_id": oid(),
+                    "restaurant": rest_doc["_id"],
+                    "outlet": outlet_id,
+                    "inventoryItem": iid,
+                    "change": -abs(qty_needed),
+                    "type": "usage",
+                    "reference": f"SEED-ORD-{order_num}-{str(iid)[:6]}",
+                    "note": f"Seed consumption for order {order_num}",
+                    "performedBy": placed_by_user,
+                    "createdAt": placed_at,
+                    "updatedAt": placed_at
+                })
+
+            # update table occupancy if pending
+            if table_for_order and status == "pending":
+                table_updates[table_for_order] = {"status": "occupied", "currentOrder": order_doc["_id"], "updatedAt": placed_at}
+            elif table_for_order:
+                table_updates[table_for_order] = {"status": "available", "currentOrder": None, "updatedAt": placed_at}
+
+        insert_many(orders_col, orders_batch)
+        if stock_usage_batch:
+            stock_bulk.bulk_write([InsertOne(d) for d in stock_usage_batch], ordered=False)
+        if table_updates:
+            tables_bulk.bulk_write([
+                UpdateOne({"_id": tid}, {"$set": fields})
+                for tid, fields in table_updates.items()
+            ], ordered=False)
+
+        # write the clamped quantities; acknowledged, since a later outlet may set
+        # the same items and unacknowledged writes could land out of order
+        if touched_inv:
+            # one timestamp per outlet, taken after its orders, so updatedAt reflects the change
+            outlet_ts = now()
+            inventory_col.bulk_write([
+                UpdateOne({"_id": iid}, {"$set": {"currentQty": inv_by_id[iid]["currentQty"], "updatedAt": outlet_ts}})
+                for iid in touched_inv
+            ], ordered=False)
+
+    return rest_doc
+
 # ---------------- Main ----------------
 def main():
     print("Connecting to MongoDB:", MONGO_URI)
-    client = MongoClient(MONGO_URI)
+    client = MongoClient(MONGO_URI, maxPoolSize=50)
     # prefer DB from URI otherwise fallback to 'pos'
     _default_db = client.get_default_database()
     db = _default_db if _default_db is not None else client["pos"]
@@ -120,328 +541,105 @@ def main():
     suppliers_col = db["suppliers"]
     inventory_col = db["inventoryitems"]
     categories_col = db["categories"]
-    menuitems_col = db["menuitems"]
     tables_col = db["tables"]
     stock_col = db["stockmovements"]
     orders_col = db["orders"]
     audit_col = db["auditlogs"]
 
+    # Seed-only bulk writes skip the per-batch ack. Inventory writes stay acknowledged
+    # because per-outlet quantity updates must apply in order, table inserts because the
+    # later status updates must find those docs, and orders because their unique index
+    # is dropped during the load.
+    bulk_db = client.get_database(db.name, write_concern=WriteConcern(w=0))
+
     print("Ensuring indexes (idempotent) ...")
     ensure_index(roles_col, [("name", 1)], unique=True)
-    ensure_index(users_col, [("email", 1)], unique=True)
-    ensure_index(categories_col, [("restaurant", 1), ("name", 1)], unique=True)
-    ensure_index(orders_col, [("restaurant", 1), ("outlet", 1), ("orderNumber", 1)], unique=True)
-
-    # Seed global roles
-    print("Seeding roles...")
-    role_docs = [
-        {"name": "SuperAdmin", "description": "Full access", "permissions": [], "scope": "global", "createdAt": now(), "updatedAt": now()},
-        {"name": "Admin", "description": "Restaurant admin", "permissions": [], "scope": "restaurant", "createdAt": now(), "updatedAt": now()},
-        {"name": "Cashier", "description": "Cashier - create orders & payments", "permissions": [], "scope": "restaurant", "createdAt": now(), "updatedAt": now()},
+    # bulk-loaded collections: drop unique indexes now and rebuild once after the load
+    deferred_indexes = [
+        (users_col, [("email", 1)]),
+        (categories_col, [("restaurant", 1), ("name", 1)]),
+        (orders_col, [("restaurant", 1), ("outlet", 1), ("orderNumber", 1)]),
     ]
-    for r in role_docs:
-        upsert_one(roles_col, {"name": r["name"]}, r)
-    roles_map = {r["name"]: roles_col.find_one({"name": r["name"]}) for r in role_docs}
-    pprint({"seeded_roles": list(roles_map.keys())})
-
-    # SuperAdmin user
-    sa_email = os.environ.get("SUPERADMIN_EMAIL", "superadmin@example.com")
-    sa_user = users_col.find_one({"email": sa_email})
-    if not sa_user:
-        print("Creating SuperAdmin user:", sa_email)
-        sa_id = oid()
-        users_col.insert_one({
-            "_id": sa_id,
-            "email": sa_email,
-            "name": os.environ.get("SUPERADMIN_NAME", "Super Admin"),
-            "passwordHash": hashed_password(os.environ.get("SUPERADMIN_PASSWORD", "superadmin123")),
-            "roles": [roles_map["SuperAdmin"]["_id"]],
-            "isActive": True,
-            "createdAt": now(),
-            "updatedAt": now()
-        })
-    else:
-        print("SuperAdmin exists:", sa_email)
-
-    all_restaurants = []
-    print(f"Creating {N_RESTAURANTS} restaurants with outlets, inventory, menus, users, tables and orders ...")
-    for r_index in range(N_RESTAURANTS):
-        rest_name = f"{fake.company()} {random.choice(['Bistro','Cafe','Kitchen','Diner','Grill','House'])}"
-        rest_doc = {
-            "_id": oid(),
-            "name": rest_name,
-            "legalName": rest_name + " Pvt Ltd",
-            "taxNumber": "GST" + uuid_short(),
-            "ownerName": fake.name(),
-            "contactEmail": fake.company_email(),
-            "contactPhone": fake.phone_number(),
-            "address": fake.address(),
-            "cuisine": random.sample(["Indian","Italian","Continental","Asian","Mexican","Fusion"], k=2),
-            "settings": {},
-            "outlets": [],
-            "createdAt": now(),
-            "updatedAt": now()
-        }
-        restaurants_col.insert_one(rest_doc)
+    for coll, keys in deferred_indexes:
+        drop_index(coll, keys)
 
-        # create 1..MAX_OUTLETS_PER_REST outlets
-        num_outlets = random.randint(1, MAX_OUTLETS_PER_REST)
-        outlet_ids = []
-        for o in range(num_outlets):
-            outlet_doc = {
-                "_id": oid(),
-                "name": f"{rest_doc['name']} - Outlet {o+1}",
-                "code": f"OLT{random.randint(1000,9999)}",
-                "address": fake.address(),
-                "phone": fake.phone_number(),
-                "timeZone": "Asia/Kolkata",
-                "currency": random.choice(["INR","USD","EUR"]),
-                "settings": {},
-                "createdAt": now(),
-                "updatedAt": now()
-            }
-            outlets_col.insert_one(outlet_doc)
-            outlet_ids.append(outlet_doc["_id"])
-
-        restaurants_col.update_one({"_id": rest_doc["_id"]}, {"$set": {"outlets": outlet_ids}})
-        print(f"Created Restaurant: {rest_doc['name']} with {len(outlet_ids)} outlets")
-
-        # create suppliers for this restaurant
-        suppliers = []
-        for s in range(2):
-            sup = {"_id": oid(), "restaurant": rest_doc["_id"], "name": fake.company(), "contact": fake.name(), "phone": fake.phone_number(), "email": fake.company_email(), "address": fake.address(), "createdAt": now(), "updatedAt": now()}
-            suppliers_col.insert_one(sup)
-            suppliers.append(sup)
-
-        # create inventory items for restaurant
-        inv_items = []
-        inv_names = generate_inventory_names(INVENTORY_ITEMS_PER_REST)
-        for name in inv_names:
-            inv = {
-                "_id": oid(),
-                "restaurant": rest_doc["_id"],
-                "outlet": random.choice(outlet_ids),
-                "name": name,
-                "sku": f"INV-{name.replace(' ','').upper()[:12]}-{random.randint(100,999)}",
-                "unit": random.choice(["kg","pcs","ltr"]),
-                "costPrice": round(random.uniform(10,500),2),
-                "currentQty": random.randint(30,300),
-                "parLevel": random.randint(5,50),
-                "supplier": random.choice(suppliers)["_id"],
-                "isTracked": True,
-                "location": "Main Store",
-                "meta": {},
-                "createdAt": now(),
-                "updatedAt": now()
-            }
-            inv_items.append(inv)
-        if inv_items:
-            inventory_col.insert_many(inv_items)
-        inv_map = {it["name"]: it for it in inv_items}
-
-        # categories
-        categories = []
-        cat_names = random.sample(["Entrees","Burgers","Drinks","Desserts","Salads","Sides","Breakfast"], k=4)
-        for i,cn in enumerate(cat_names):
-            c = {"_id": oid(), "restaurant": rest_doc["_id"], "name": cn, "order": i+1, "isVisible": True, "createdAt": now(), "updatedAt": now()}
-            categories_col.insert_one(c)
-            categories.append(c)
-
-        # menu items
-        menu_items = []
-        for m in range(MENU_ITEMS_PER_REST):
-            cat = random.choice(categories)
-            item_name = (fake.catch_phrase().split(" - ")[0][:30]).strip() + " " + random.choice(["Special","Deluxe","Classic","Platter","Bowl"])
-            base_price = round(random.uniform(80,600),2)
-            # build recipe: pick 1-4 inventory items
-            recipe = []
-            for _ in range(random.randint(1,4)):
-                if not inv_items:
-                    break
-                inv_choice = random.choice(inv_items)
-                qty = round(random.uniform(0.01, 1.5), 3) if inv_choice["unit"]=="kg" else random.randint(1,3)
-                recipe.append({"inventoryItemId": inv_choice["_id"], "qty": qty, "unit": inv_choice["unit"]})
-            menu = {
-                "_id": oid(),
-                "restaurant": rest_doc["_id"],
-                "categories": [cat["_id"]],
-                "name": item_name,
-                "description": fake.sentence(nb_words=8),
-                "image": None,
-                "basePrice": base_price,
-                "sku": f"MI-{random.randint(100000,999999)}",
+    seeded = False
+    try:
+        # Seed global roles
+        print("Seeding roles...")
+        ts = now()
+        role_docs = [
+            {"name": "SuperAdmin", "description": "Full access", "permissions": [], "scope": "global", "createdAt": ts, "updatedAt": ts},
+            {"name": "Admin", "description": "Restaurant admin", "permissions": [], "scope": "restaurant", "createdAt": ts, "updatedAt": ts},
+            {"name": "Cashier", "description": "Cashier - create orders & payments", "permissions": [], "scope": "restaurant", "createdAt": ts, "updatedAt": ts},
+        ]
+        # upsert_one returns the post-update doc, so no follow-up find is needed
+        roles_map = {r["name"]: upsert_one(roles_col, {"name": r["name"]}, r) for r in role_docs}
+        pprint({"seeded_roles": list(roles_map.keys())})
+
+        # SuperAdmin user
+        sa_email = os.environ.get("SUPERADMIN_EMAIL", "superadmin@example.com")
+        sa_user = users_col.find_one({"email": sa_email})
+        if not sa_user:
+            print("Creating SuperAdmin user:", sa_email)
+            sa_id = oid()
+            users_col.insert_one({
+                "_id": sa_id,
+                "email": sa_email,
+                "name": os.environ.get("SUPERADMIN_NAME", "Super Admin"),
+                "passwordHash": hashed_password(os.environ.get("SUPERADMIN_PASSWORD", "superadmin123")),
+                "roles": [roles_map["SuperAdmin"]["_id"]],
                 "isActive": True,
-                "isTaxable": True,
-                "variants": [],
-                "modifiers": [{"name": "Extra", "price": round(base_price*0.25,2)}] if random.random() < 0.3 else [],
-                "prepTimeMins": random.randint(2,25),
-                "tags": [],
-                "meta": {"recipe": recipe},
-                "outletAvailability": [{"outlet": random.choice(outlet_ids), "isAvailable": True}],
-                "createdAt": now(),
-                "updatedAt": now()
-            }
-            menu_items.append(menu)
-        if menu_items:
-            menuitems_col.insert_many(menu_items)
-
-        # tables per outlet
-        for outlet_id in outlet_ids:
-            tables = []
-            for tnum in range(1, TABLES_PER_OUTLET+1):
-                t = {
-                    "_id": oid(),
-                    "restaurant": rest_doc["_id"],
-                    "outlet": outlet_id,
-                    "name": f"Table {tnum}",
-                    "seats": random.choice([2,4,6]),
-                    "zone": random.choice(["Main Floor","Patio","Balcony"]),
-                    "status": "available",
-                    "meta": {},
-                    "createdAt": now(),
-                    "updatedAt": now()
-                }
-                tables.append(t)
-            if tables:
-                tables_col.insert_many(tables)
-
-        # users: admin + cashiers
-        admin_user = {
-    "_id": oid(),
-    "email": f"admin+{uuid_short()}@{fake.domain_name()}",
-    "name": f"{rest_doc['name']} Admin",
-    "passwordHash": hashed_password(DEFAULT_PASSWORD),
-    "restaurant": rest_doc["_id"],
-    "roles": [roles_map["Admin"]["_id"]],
-    "isActive": True,
-    "createdAt": now(),
-    "updatedAt": now()
-}
-
-        users_col.insert_one(admin_user)
-        for ccount in range(random.randint(1,3)):
-            cash_user = {
-    "_id": oid(),
-    "email": f"cashier{ccount+1}-{uuid_short()}@{fake.domain_name()}",
-    "name": f"Cashier {ccount+1} {rest_doc['name']}",
-    "passwordHash": hashed_password(DEFAULT_PASSWORD),
-    "restaurant": rest_doc["_id"],
-    "roles": [roles_map["Cashier"]["_id"]],
-    "outlet": random.choice(outlet_ids),
-    "isActive": True,
-    "createdAt": now(),
-    "updatedAt": now()
-}
-
-            users_col.insert_one(cash_user)
-
-        # initial stock movements
-        stock_moves = []
-        for inv in inv_items:
-            stock_moves.append({
-                "_id": oid(),
-                "restaurant": rest_doc["_id"],
-                "outlet": inv["outlet"],
-                "inventoryItem": inv["_id"],
-                "change": inv["currentQty"],
-                "type": "purchase",
-                "reference": f"INIT-{inv['_id']}",
-                "note": "Initial stock seed",
-                "performedBy": admin_user["_id"],
-                "createdAt": now(),
-                "updatedAt": now()
+                "createdAt": ts,
+                "updatedAt": ts
             })
-        if stock_moves:
-            stock_col.insert_many(stock_moves)
-
-        # Create orders per outlet
-        for outlet_id in outlet_ids:
-            menus_for_outlet = list(menuitems_col.find({"restaurant": rest_doc["_id"], "outletAvailability.outlet": outlet_id}).limit(500))
-            if not menus_for_outlet:
-                menus_for_outlet = list(menuitems_col.find({"restaurant": rest_doc["_id"]}).limit(500))
-            tables_for_outlet = list(tables_col.find({"restaurant": rest_doc["_id"], "outlet": outlet_id}))
-            for ord_idx in range(ORDERS_PER_OUTLET):
-                chosen_items = []
-                for _ in range(random.randint(1,4)):
-                    if not menus_for_outlet:
-                        break
-                    mi = random.choice(menus_for_outlet)
-                    qty = random.choice([1,1,1,2])
-                    chosen_items.append({
-                        "menuItem": mi["_id"],
-                        "name": mi["name"],
-                        "qty": qty,
-                        "price": mi["basePrice"]
-                    })
-                subtotal = sum(it["price"] * it["qty"] for it in chosen_items)
-                status = random.choices(["completed","pending","cancelled"], weights=[0.6,0.25,0.15])[0]
-                order_num = f"ORD-{int(datetime.now().timestamp())}-{random.randrange(1000,9999)}-{uuid_short()}"
-                placed_by_user = admin_user["_id"]
-                placed_at = now()
-                table_for_order = random.choice(tables_for_outlet)["_id"] if tables_for_outlet else None
-
-                order_doc = {
-                    "_id": oid(),
-                    "restaurant": rest_doc["_id"],
-                    "outlet": outlet_id,
-                    "table": table_for_order,
-                    "orderNumber": order_num,
-                    "type": "dine_in" if table_for_order else "counter",
-                    "items": chosen_items,
-                    "subtotal": subtotal,
-                    "taxTotal": 0,
-                    "discountTotal": 0,
-                    "serviceCharge": 0,
-                    "total": subtotal,
-                    "payments": [{"method": "cash", "amount": subtotal, "transactionRef": f"TX-{order_num}", "paidAt": placed_at}] if status == "completed" else [],
-                    "status": status,
-                    "placedAt": placed_at,
-                    "placedBy": placed_by_user,
-                    "notes": "",
-                    "meta": {"seed": True},
-                    "createdAt": placed_at,
-                    "updatedAt": placed_at
-                }
-                orders_col.insert_one(order_doc)
-
-                # compute and apply consumption
-                consumptions = {}
-                for it in chosen_items:
-                    menu_item = menuitems_col.find_one({"_id": it["menuItem"]})
-                    recipe = (menu_item.get("meta") or {}).get("recipe", [])
-                    for r in recipe:
-                        iid = r["inventoryItemId"]
-                        qty_needed = (r.get("qty", 0) or 0) * it["qty"]
-                        consumptions[str(iid)] = consumptions.get(str(iid), 0) + qty_needed
-
-                for iid_str, qty_needed in consumptions.items():
-                    iid = ObjectId(iid_str)
-                    inv_item = inventory_col.find_one({"_id": iid})
-                    if not inv_item:
-                        continue
-                    new_qty = max(0, inv_item.get("currentQty", 0) - qty_needed)
-                    inventory_col.update_one({"_id": iid}, {"$set": {"currentQty": new_qty, "updatedAt": now()}})
-                    stock_col.insert_one({
-                        "_id": oid(),
-                        "restaurant": rest_doc["_id"],
-                        "outlet": outlet_id,
-                        "inventoryItem": iid,
-                        "change": -abs(qty_needed),
-                        "type": "usage",
-                        "reference": f"SEED-ORD-{order_num}-{iid_str[:6]}",
-                        "note": f"Seed consumption for order {order_num}",
-                        "performedBy": placed_by_user,
-                        "createdAt": now(),
-                        "updatedAt": now()
-                    })
-
-                # update table occupancy if pending
-                if table_for_order and status == "pending":
-                    tables_col.update_one({"_id": table_for_order}, {"$set": {"status": "occupied", "currentOrder": order_doc["_id"], "updatedAt": now()}})
-                elif table_for_order:
-                    tables_col.update_one({"_id": table_for_order}, {"$set": {"status": "available", "currentOrder": None, "updatedAt": now()}})
-
-        all_restaurants.append(rest_doc)
+        else:
+            print("SuperAdmin exists:", sa_email)
+
+        # every restaurant user shares DEFAULT_PASSWORD, so hash it once
+        default_pw_hash = hashed_password(DEFAULT_PASSWORD)
+
+        print(f"Creating {N_RESTAURANTS} restaurants with outlets, inventory, menus, users, tables and orders ...")
+        shared_ctx = {
+            "restaurants_col": restaurants_col,
+            "outlets_col": outlets_col,
+            "suppliers_col": suppliers_col,
+            "categories_col": categories_col,
+            "users_col": users_col,
+            "stock_col": stock_col,
+            "inventory_col": inventory_col,
+            "tables_col": tables_col,
+            "orders_col": orders_col,
+            "menuitems_bulk": bulk_db["menuitems"],
+            "tables_bulk": bulk_db["tables"],
+            "stock_bulk": bulk_db[stock_col.name],
+            "roles_map": roles_map,
+            "default_pw_hash": default_pw_hash,
+            # generated up front; each worker only reads its own slot
+            "fake_pools": [generate_fake_pool() for _ in range(N_RESTAURANTS)],
+            # one seeded Random per restaurant keeps runs reproducible under threads
+            "rngs": [random.Random(SEED + r_index) for r_index in range(N_RESTAURANTS)],
+        }
+        # restaurants are independent; MongoClient is thread-safe and shared by all workers
+        with ThreadPoolExecutor(max_workers=max(1, min(N_RESTAURANTS, SEED_WORKERS))) as pool:
+            futures = [pool.submit(seed_restaurant, r_index, shared_ctx) for r_index in range(N_RESTAURANTS)]
+            all_restaurants = []
+            for fut in futures:
+                rest_doc = fut.result()
+                # printed here rather than in the worker so lines don't interleave
+                print(f"Created Restaurant: {rest_doc['name']} with {len(rest_doc['outlets'])} outlets")
+                all_restaurants.append(rest_doc)
+        seeded = True
+    finally:
+        # runs even if a worker fails, so the unique constraints are never left dropped
+        print("Rebuilding indexes ...")
+        try:
+            rebuild_indexes(deferred_indexes)
+        except Exception as e:
+            if seeded:
+                raise
+            # seeding already failed; report this without masking the original error
+            print("Index rebuild failed:", e, file=sys.stderr)
 
     print("\n=== SEEDING COMPLETE ===")
     print("Restaurants created:", len(all_restaurants))